@@ -2,14 +2,24 @@
 from __future__ import annotations
 
 import functools
-import json
 import os
-import re
+import sqlite3
+import string
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from html import unescape
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional, Tuple
-from urllib import error, parse, request as urlrequest
-
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import quote_plus
+
+import orjson
+import urllib3
+from cachetools import TTLCache
+from diskcache import Cache
+from diskcache import Timeout as DiskCacheTimeout
 from flask import (
     Flask,
     Response,
@@ -20,35 +30,102 @@ from flask import (
     request,
     url_for,
 )
+from flask_orjson import OrjsonProvider
 
 from vocab import (
     DEFAULT_STORAGE,
+    REVIEW_STATE_FIELDS,
     VocabularyStore,
     create_entry,
-    get_due_entries,
-    sort_entries,
     update_review_state,
 )
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config["SECRET_KEY"] = "enlearn-secret-key"  # Needed for flashing messages
 
 TRANSLATION_ENDPOINT = "https://translate.googleapis.com/translate_a/single"
+# Query parameters that never change between lookups: the ``gtx`` client, JSON
+# dictionary output (``dj=1``) and the data sections we extract (``dt``).
+_BASE_QUERY = "client=gtx&dj=1&dt=t&dt=bd&dt=md&dt=at&dt=ex"
 TRANSLATION_TIMEOUT = 6  # seconds
+# ``/lookup`` only ever shows this many example sentences, so extraction stops
+# early instead of cleaning (and caching) the whole ``examples`` array.
+EXAMPLE_LIMIT = 5
+# Maximum number of distinct meanings returned for a single word.
+TRANSLATION_LIMIT = 8
+# Maximum number of upstream translation requests in flight at once.
+TRANSLATION_CONCURRENCY = 16
+# Maximum number of words accepted by a single ``/lookup_batch`` request.
+MAX_BATCH_WORDS = 32
+# How long ``/lookup_batch`` waits for uncached words before answering without
+# them.
+BATCH_LOOKUP_TIMEOUT = TRANSLATION_TIMEOUT * 2
+# Upper bound for the in-memory translation cache, measured in serialized
+# payload bytes rather than entries so a handful of oversized responses cannot
+# balloon the worker's memory.
+TRANSLATION_CACHE_BYTES = 2_000_000
+TRANSLATION_CACHE_TTL = 24 * 60 * 60  # seconds
+# Failed lookups are usually transient network errors; remember them (and any
+# fallback-language result served in their place) only briefly so a burst of
+# retries does not hammer the upstream API.
+FAILED_LOOKUP_CACHE_SIZE = 1024
+FAILED_LOOKUP_CACHE_TTL = 5 * 60  # seconds
+# Translations are also persisted on disk so that restarted or additional
+# workers start warm instead of re-querying the upstream API.
+TRANSLATION_DISK_CACHE_BYTES = 50_000_000
+TRANSLATION_DISK_CACHE_EXPIRE = 30 * 24 * 60 * 60  # seconds
 DEFAULT_TRANSLATION_LANGPAIR = "EN|ZH-TW"
 DEFAULT_LANGPAIR_TUPLE: Tuple[str, str] = tuple(
     DEFAULT_TRANSLATION_LANGPAIR.split("|")
 )
-# Accept ISO-639 two/three letter language codes with an optional region/script
-# segment (e.g. ``EN``, ``EN-US``, ``ZH-TW``, ``SR-LATN``). Wider values such as
-# ``AUTO`` are rejected so we can gracefully fall back to the safe default.
-_LANG_CODE_RE = re.compile(r"^[A-Za-z]{2,3}(?:-[A-Za-z0-9]{2,8})?$")
-_WORD_VALIDATION_RE = re.compile(r"^[A-Za-z][A-Za-z\s'-]*$")
+# Words must start with an ASCII letter and may then contain letters,
+# whitespace, apostrophes and hyphens. Deleting every allowed character with
+# ``str.translate`` leaves nothing (or only non-ASCII whitespace) for valid
+# input, which is cheaper than running a regex for these short strings.
+_WORD_START_CHARS = frozenset(string.ascii_letters)
+_WORD_DELETE_TABLE = str.maketrans("", "", string.ascii_letters + string.whitespace + "'-")
+# ``/lookup`` accepts arbitrary text, so overly long input is rejected early.
+# The add form limits the word field to the same length.
+MAX_WORD_LENGTH = 100
+
+
+class _TranslationRetry(urllib3.Retry):
+    """Retry policy that never retries a read timeout.
+
+    urllib3 counts read timeouts as read errors, so a plain ``read`` budget
+    would wait out the timeout again on a stalled upstream. Other read errors,
+    such as a keep-alive connection the server closed while the request was in
+    flight, still use the ``read`` budget.
+    """
+
+    def increment(self, method=None, url=None, response=None, error=None, *args, **kwargs):
+        if isinstance(error, urllib3.exceptions.ReadTimeoutError):
+            raise urllib3.exceptions.MaxRetryError(kwargs.get("_pool"), url, error) from error
+        return super().increment(method, url, response, error, *args, **kwargs)
+
+
+# Shared connection pool so cache misses reuse keep-alive TLS connections to the
+# translation endpoint instead of paying a fresh handshake on every lookup. All
+# requests go to a single host, so one pool sized to the lookup concurrency is
+# enough. A failed connect is retried on half the timeout, so a lookup waits no
+# longer than one full-timeout connect would. A dropped connection is retried
+# once, but a read timeout is not (see ``_TranslationRetry``).
+_HTTP = urllib3.PoolManager(
+    num_pools=1,
+    maxsize=TRANSLATION_CONCURRENCY,
+    timeout=urllib3.Timeout(connect=TRANSLATION_TIMEOUT / 2, read=TRANSLATION_TIMEOUT),
+    retries=_TranslationRetry(connect=1, read=1, redirect=5, status=0),
+    headers={"User-Agent": "enlearn-vocab-app/1.0"},
+)
 
 
 app.config["TRANSLATION_LANGPAIR"] = os.environ.get(
     "TRANSLATION_LANGPAIR", DEFAULT_TRANSLATION_LANGPAIR
 )
+app.config["TRANSLATION_CACHE_DIR"] = os.environ.get(
+    "TRANSLATION_CACHE_DIR", str(DEFAULT_STORAGE.parent / "translation-cache")
+)
 
 
 def get_store() -> VocabularyStore:
@@ -69,30 +146,33 @@ def _normalize_translation(raw: Optional[str], original: str) -> Optional[str]:
 
 
 def _sanitize_lang_code(code: str) -> Optional[str]:
-    code = code.strip()
-    if not code:
+    # Accept ISO-639 two/three letter language codes with an optional
+    # region/script segment (e.g. ``EN``, ``EN-US``, ``ZH-TW``, ``SR-LATN``).
+    # Wider values such as ``AUTO`` are rejected so we can gracefully fall back
+    # to the safe default. The grammar is tiny, so it is checked with plain
+    # string predicates rather than a regex.
+    primary, sep, rest = code.strip().partition("-")
+    if not (2 <= len(primary) <= 3 and primary.isascii() and primary.isalpha()):
         return None
 
-    match = _LANG_CODE_RE.match(code)
-    if not match:
-        return None
+    if not sep:
+        return primary.upper()
 
-    primary, _, rest = code.partition("-")
-    primary = primary.upper()
-    # ``_LANG_CODE_RE`` already guarantees 2-3 characters for the primary tag,
-    # but we keep the explicit guard to make the intent obvious and future-
-    # proof the check should the regex change.
-    if len(primary) not in (2, 3):
+    if not (2 <= len(rest) <= 8 and rest.isascii() and rest.isalnum()):
         return None
 
-    if not rest:
-        return primary
-
-    return f"{primary}-{rest.upper()}"
+    return f"{primary.upper()}-{rest.upper()}"
 
 
 def _resolve_langpair() -> Tuple[str, str]:
     raw = str(app.config.get("TRANSLATION_LANGPAIR", DEFAULT_TRANSLATION_LANGPAIR))
+    return _parse_langpair(raw)
+
+
+# The configured language pair practically never changes, so parsing and
+# validating it is memoized on the raw config string.
+@functools.lru_cache(maxsize=4)
+def _parse_langpair(raw: str) -> Tuple[str, str]:
     segments = raw.split("|")
     if len(segments) != 2:
         return DEFAULT_LANGPAIR_TUPLE
@@ -107,53 +187,43 @@ def _is_valid_word(word: str) -> bool:
     """Return ``True`` when the word looks like an English word or phrase."""
 
     cleaned = word.strip()
-    if not cleaned:
+    if not cleaned or len(cleaned) > MAX_WORD_LENGTH:
+        return False
+
+    if cleaned[0] not in _WORD_START_CHARS:
         return False
 
-    return bool(_WORD_VALIDATION_RE.match(cleaned))
+    rest = cleaned.translate(_WORD_DELETE_TABLE)
+    return not rest or rest.isspace()
 
 
 def _format_lang_for_google(code: str) -> str:
-    primary, _, rest = code.partition("-")
-    primary = primary.lower()
-    if rest:
-        return f"{primary}-{rest.lower()}"
-    return primary
+    # Codes come from ``_sanitize_lang_code`` (``XX`` or ``XX-YYYY``), so
+    # lower-casing the whole string lower-cases each subtag.
+    return code.lower()
 
 
 def _fetch_translation_payload(word: str, langpair: Tuple[str, str]) -> Optional[dict]:
     source, target = langpair
-    params = {
-        "client": "gtx",
-        "sl": _format_lang_for_google(source),
-        "tl": _format_lang_for_google(target),
-        "dj": "1",
-        "dt": ["t", "bd", "md", "at", "ex"],
-        "q": word,
-    }
-    # ``urlencode`` cannot encode list values by default, so we manually expand them.
-    query_parts: List[Tuple[str, str]] = []
-    for key, value in params.items():
-        if isinstance(value, list):
-            for item in value:
-                query_parts.append((key, item))
-        else:
-            query_parts.append((key, value))
-    url = f"{TRANSLATION_ENDPOINT}?{parse.urlencode(query_parts)}"
-    req = urlrequest.Request(
-        url,
-        headers={"User-Agent": "enlearn-vocab-app/1.0"},
+    url = (
+        f"{TRANSLATION_ENDPOINT}?{_BASE_QUERY}"
+        f"&sl={quote_plus(_format_lang_for_google(source))}"
+        f"&tl={quote_plus(_format_lang_for_google(target))}"
+        f"&q={quote_plus(word)}"
     )
 
     try:
-        with urlrequest.urlopen(req, timeout=TRANSLATION_TIMEOUT) as resp:
-            payload = resp.read()
-    except (error.URLError, TimeoutError, ValueError, OSError):
+        resp = _HTTP.request("GET", url)
+    except (urllib3.exceptions.HTTPError, TimeoutError, ValueError, OSError):
+        return None
+    if resp.status != 200:
         return None
+    payload = resp.data
 
     try:
-        data = json.loads(payload)
-    except json.JSONDecodeError:
+        data = orjson.loads(payload)
+    except ValueError:
+        # ``orjson.JSONDecodeError`` subclasses ``ValueError``.
         return None
 
     if isinstance(data, dict):
@@ -161,56 +231,115 @@ def _fetch_translation_payload(word: str, langpair: Tuple[str, str]) -> Optional
     return None
 
 
-def _extract_translations(data: dict, original: str) -> List[str]:
-    results: List[str] = []
-
-    def add(value: Optional[str]) -> None:
-        normalized = _normalize_translation(value, original)
-        if normalized and normalized not in results:
-            results.append(normalized)
-
-    sentences = data.get("sentences")
-    if isinstance(sentences, list):
-        for sentence in sentences:
-            if isinstance(sentence, dict):
-                add(sentence.get("trans"))
-            elif isinstance(sentence, list) and sentence:
-                add(str(sentence[0]))
-
-    dictionary_entries = data.get("dict")
-    if isinstance(dictionary_entries, list):
-        for entry in dictionary_entries:
-            if not isinstance(entry, dict):
+# Google's response schema is stable, so the section extractors below call
+# ``.get`` directly and skip items that are not objects when it raises. Nested
+# arrays are still checked to be lists: iterating a stray string or object
+# instead would yield its characters or keys as translations.
+def _yield_sentence_trans(sentences: List[Any]) -> Iterator[Optional[str]]:
+    for sentence in sentences:
+        try:
+            value = sentence.get("trans")
+        except AttributeError:
+            if not (isinstance(sentence, list) and sentence):
                 continue
+            value = str(sentence[0])
+        yield value
+
+
+def _yield_dict_terms(dictionary_entries: List[Any]) -> Iterator[Optional[str]]:
+    for entry in dictionary_entries:
+        try:
             terms = entry.get("terms")
-            if isinstance(terms, list):
-                for term in terms:
-                    add(str(term))
             entry_terms = entry.get("entry")
-            if isinstance(entry_terms, list):
-                for item in entry_terms:
-                    if isinstance(item, dict):
-                        add(item.get("word"))
-
-    alternative_translations = data.get("alternative_translations")
-    if isinstance(alternative_translations, list):
-        for alt in alternative_translations:
-            if not isinstance(alt, dict):
-                continue
+        except AttributeError:
+            continue
+        if isinstance(terms, list):
+            for term in terms:
+                yield str(term)
+        if isinstance(entry_terms, list):
+            for item in entry_terms:
+                try:
+                    value = item.get("word")
+                except AttributeError:
+                    continue
+                yield value
+
+
+def _yield_alt_words(alternatives: List[Any]) -> Iterator[Optional[str]]:
+    for alt in alternatives:
+        try:
             entries = alt.get("entries")
-            if isinstance(entries, list):
-                for entry in entries:
-                    if isinstance(entry, dict):
-                        add(entry.get("word"))
+        except AttributeError:
+            continue
+        if not isinstance(entries, list):
+            continue
+        for entry in entries:
+            try:
+                value = entry.get("word")
+            except AttributeError:
+                continue
+            yield value
 
-    return results
+
+# Response sections holding translations, in the order they are preferred.
+_EXTRACTORS: Tuple[Tuple[str, Callable[[List[Any]], Iterator[Optional[str]]]], ...] = (
+    ("sentences", _yield_sentence_trans),
+    ("dict", _yield_dict_terms),
+    ("alternative_translations", _yield_alt_words),
+)
+
+
+def _iter_translations(data: dict, original: str) -> Iterator[str]:
+    """Yield distinct, normalized translations in the order Google lists them."""
+
+    seen: Set[str] = set()
+    for key, extract in _EXTRACTORS:
+        section = data.get(key)
+        if not isinstance(section, list):
+            continue
+        for raw in extract(section):
+            normalized = _normalize_translation(raw, original)
+            if normalized and normalized not in seen:
+                seen.add(normalized)
+                yield normalized
+
+
+def _extract_translations(
+    data: dict, original: str, limit: int = TRANSLATION_LIMIT
+) -> List[str]:
+    # The generator is consumed lazily, so the remaining sections are not
+    # walked once ``limit`` translations have been collected.
+    return list(islice(_iter_translations(data, original), limit))
 
 
 def _strip_html_tags(text: str) -> str:
-    return re.sub(r"<[^>]+>", "", text)
+    """Remove ``<...>`` spans from ``text``.
+
+    Equivalent to ``re.sub(r"<[^>]+>", "", text)`` but implemented with plain
+    ``str.find`` calls, which is noticeably cheaper for short example strings.
+    Empty ``<>`` pairs and an unterminated trailing ``<`` are kept verbatim.
+    """
+
+    parts: List[str] = []
+    start = 0
+    while True:
+        open_idx = text.find("<", start)
+        if open_idx < 0:
+            parts.append(text[start:])
+            break
+        close_idx = text.find(">", open_idx + 1)
+        if close_idx < 0:
+            parts.append(text[start:])
+            break
+        if close_idx == open_idx + 1:
+            parts.append(text[start:close_idx + 1])
+        else:
+            parts.append(text[start:open_idx])
+        start = close_idx + 1
+    return "".join(parts)
 
 
-def _extract_examples(data: dict) -> List[str]:
+def _extract_examples(data: dict, limit: int = EXAMPLE_LIMIT) -> List[str]:
     results: List[str] = []
 
     examples_section = data.get("examples")
@@ -223,64 +352,258 @@ def _extract_examples(data: dict) -> List[str]:
                 raw = item.get("text")
                 if not isinstance(raw, str):
                     continue
-                cleaned = unescape(_strip_html_tags(raw)).strip()
+                # Most example sentences carry neither markup nor entities, so
+                # a cheap membership test skips both passes in the common case.
+                cleaned = raw
+                if "<" in cleaned:
+                    cleaned = _strip_html_tags(cleaned)
+                if "&" in cleaned:
+                    cleaned = unescape(cleaned)
+                cleaned = cleaned.strip()
                 if cleaned and cleaned not in results:
                     results.append(cleaned)
+                    if len(results) >= limit:
+                        break
 
     return results
 
 
-@functools.lru_cache(maxsize=256)
-def _lookup_translation_data_cached(sanitized_word: str) -> Optional[dict]:
-    langpair = _resolve_langpair()
+# Cached lookups store the extracted ``(translations, examples)`` pair so cache
+# hits skip both the upstream request and the extractors.
+TranslationResult = Tuple[List[str], List[str]]
+
+
+def _cached_size(value: TranslationResult) -> int:
+    return len(orjson.dumps(value))
+
+
+_TRANSLATION_CACHE: TTLCache = TTLCache(
+    maxsize=TRANSLATION_CACHE_BYTES,
+    ttl=TRANSLATION_CACHE_TTL,
+    getsizeof=_cached_size,
+)
+_FAILED_LOOKUPS: TTLCache = TTLCache(
+    maxsize=FAILED_LOOKUP_CACHE_SIZE, ttl=FAILED_LOOKUP_CACHE_TTL
+)
+_TRANSLATION_CACHE_LOCK = threading.RLock()
+_INFLIGHT: Dict[Tuple[str, Tuple[str, str]], Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+# Workers for translation lookups that run outside the request thread, either
+# in the background or fanned out to overlap several upstream requests.
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=TRANSLATION_CONCURRENCY, thread_name_prefix="translation"
+)
+_MISSING = object()
+# Stands in for a batch lookup result that was not ready in time.
+_PENDING = object()
+
+
+@functools.lru_cache(maxsize=None)
+def _open_disk_cache(directory: str) -> Cache:
+    cache = Cache(directory, size_limit=TRANSLATION_DISK_CACHE_BYTES)
+    # diskcache only evicts expired items lazily while writing, so sweep them
+    # once when a process first opens the cache to keep the file from holding
+    # on to stale translations between quiet periods.
+    cache.expire()
+    return cache
+
+
+# The disk cache only saves upstream requests, so an unusable cache directory
+# or a locked database degrades to a cache miss instead of failing lookups.
+_DISK_CACHE_ERRORS = (OSError, sqlite3.Error, DiskCacheTimeout)
+
+
+def _get_disk_cache() -> Cache:
+    return _open_disk_cache(str(app.config["TRANSLATION_CACHE_DIR"]))
+
+
+def _disk_get(key: Tuple[str, Tuple[str, str]]) -> Any:
+    try:
+        return _get_disk_cache().get(key, _MISSING)
+    except _DISK_CACHE_ERRORS:
+        return _MISSING
+
+
+def _disk_set(key: Tuple[str, Tuple[str, str]], value: TranslationResult) -> None:
+    try:
+        _get_disk_cache().set(key, value, expire=TRANSLATION_DISK_CACHE_EXPIRE)
+    except _DISK_CACHE_ERRORS:
+        pass
+
+
+def _remember(
+    key: Tuple[str, Tuple[str, str]],
+    value: Optional[TranslationResult],
+    failed: bool = False,
+) -> None:
+    """Cache a lookup result in memory.
+
+    ``None`` results, and results for lookups flagged as ``failed`` (the
+    configured language pair failed and another one answered), are kept only
+    for ``FAILED_LOOKUP_CACHE_TTL`` so the lookup is retried soon.
+    """
+
+    with _TRANSLATION_CACHE_LOCK:
+        if value is None or failed:
+            _TRANSLATION_CACHE.pop(key, None)
+            _FAILED_LOOKUPS[key] = value
+            return
+        _FAILED_LOOKUPS.pop(key, None)
+        try:
+            _TRANSLATION_CACHE[key] = value
+        except ValueError:
+            # The result alone exceeds the cache budget; skip caching it.
+            pass
+
+
+def _get_cached(key: Tuple[str, Tuple[str, str]]) -> Any:
+    """Return a cached lookup result or ``_MISSING``.
+
+    The in-memory cache is consulted first; hits from the persistent disk
+    cache are promoted into memory so repeated lookups stay in-process.
+    """
+
+    with _TRANSLATION_CACHE_LOCK:
+        cached = _TRANSLATION_CACHE.get(key, _MISSING)
+        if cached is _MISSING:
+            cached = _FAILED_LOOKUPS.get(key, _MISSING)
+    if cached is not _MISSING:
+        return cached
+    stored = _disk_get(key)
+    if stored is not _MISSING:
+        _remember(key, stored)
+    return stored
+
+
+def _load_translation(
+    sanitized_word: str, langpair: Tuple[str, str]
+) -> Optional[TranslationResult]:
+    key = (sanitized_word, langpair)
+    fetched_langpair = langpair
     data = _fetch_translation_payload(sanitized_word, langpair)
     if not data and langpair != DEFAULT_LANGPAIR_TUPLE:
+        fetched_langpair = DEFAULT_LANGPAIR_TUPLE
         data = _fetch_translation_payload(sanitized_word, DEFAULT_LANGPAIR_TUPLE)
-    return data
 
+    result: Optional[TranslationResult] = None
+    if data:
+        result = (
+            _extract_translations(data, sanitized_word),
+            _extract_examples(data),
+        )
 
-def _get_translation_data(word: str) -> Optional[dict]:
-    sanitized = word.strip()
-    if not sanitized:
-        return None
-    return _lookup_translation_data_cached(sanitized)
+    if result is not None:
+        # Failed lookups are usually transient network errors, so only
+        # successful results are persisted, under the pair that produced them.
+        _disk_set((sanitized_word, fetched_langpair), result)
+    _remember(key, result, failed=fetched_langpair != langpair)
+    return result
 
 
-@functools.lru_cache(maxsize=256)
-def lookup_translation(word: str) -> Optional[List[str]]:
-    """Fetch a translation for ``word`` from the external API."""
+def _peek_translation(sanitized_word: str) -> Any:
+    """Return the cached lookup result for a word, or ``_MISSING`` if unknown.
 
-    sanitized = word.strip()
-    if not sanitized:
-        return None
+    Unlike :func:`_lookup_cached` this never contacts the upstream API.
+    """
 
-    data = _get_translation_data(sanitized)
-    if not data:
-        return None
+    return _get_cached((sanitized_word, _resolve_langpair()))
 
-    translations = _extract_translations(data, sanitized)
-    return translations or None
+
+def _lookup_cached(sanitized_word: str) -> Optional[TranslationResult]:
+    langpair = _resolve_langpair()
+    key = (sanitized_word, langpair)
+    cached = _get_cached(key)
+    if cached is not _MISSING:
+        return cached
+
+    # Coalesce concurrent misses for the same word so that only one thread
+    # queries the upstream API while the others wait for its result.
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = Future()
+            _INFLIGHT[key] = future
+    if not is_leader:
+        return future.result()
+
+    try:
+        # A previous leader may have cached the result and left ``_INFLIGHT``
+        # between our cache miss above and taking the lock.
+        result = _get_cached(key)
+        if result is _MISSING:
+            result = _load_translation(sanitized_word, langpair)
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(result)
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+    return result
+
+
+def _lookup_many(words: Iterable[str]) -> Dict[str, Any]:
+    """Look up several sanitized words, overlapping the upstream requests.
+
+    Cached words are answered inline; misses are fetched concurrently on the
+    shared executor so a batch costs roughly one upstream round trip. Words
+    still pending after ``BATCH_LOOKUP_TIMEOUT`` map to ``_PENDING``; their
+    lookups keep running in the background and fill the cache.
+    """
+
+    results: Dict[str, Any] = {}
+    pending: Dict[str, Future] = {}
+    for word in dict.fromkeys(words):
+        cached = _peek_translation(word)
+        if cached is _MISSING:
+            pending[word] = _EXECUTOR.submit(_lookup_cached, word)
+        else:
+            results[word] = cached
+    deadline = time.monotonic() + BATCH_LOOKUP_TIMEOUT
+    for word, future in pending.items():
+        try:
+            results[word] = future.result(max(deadline - time.monotonic(), 0))
+        except FutureTimeoutError:
+            results[word] = _PENDING
+    return results
+
+
+def _lookup_response(result: Optional[TranslationResult]) -> dict:
+    if not result:
+        return {"status": "not_found", "translation": "", "examples": []}
+
+    translations, examples = result
+    if translations:
+        return {
+            "status": "ok",
+            "translation": "；".join(translations),
+            "meanings": translations,
+            "examples": examples,
+        }
+
+    return {"status": "not_found", "translation": "", "examples": examples}
 
 
 @app.get("/")
 def index() -> str:
     store = get_store()
-    entries = store.load()
-    due_entries = get_due_entries(entries)
+    # Only the counts are shown here, so skip building the sorted views.
+    entries, due_count = store.load_with_due_count()
     return render_template(
         "index.html",
-        due_count=len(due_entries),
+        due_count=due_count,
         total_count=len(entries),
         storage_path=store.path,
+        max_word_length=MAX_WORD_LENGTH,
     )
 
 
 @app.get("/vocab")
 def vocab_book() -> str:
     store = get_store()
-    entries = store.load()
-    sorted_entries = sort_entries(entries)
-    due_entries = get_due_entries(entries)
+    _, sorted_entries, due_entries = store.load_with_derived()
     return render_template(
         "vocab.html",
         entries=sorted_entries,
@@ -300,32 +623,39 @@ def lookup() -> Response:
     if not _is_valid_word(word):
         return jsonify({"status": "invalid", "translation": "", "examples": []}), 200
 
-    data = _get_translation_data(word)
-    if not data:
-        return jsonify({"status": "not_found", "translation": "", "examples": []}), 200
-
-    translations = _extract_translations(data, word)
-    examples = _extract_examples(data)
-    if translations:
-        joined = "；".join(translations)
-        return (
-            jsonify({
-                "status": "ok",
-                "translation": joined,
-                "meanings": translations,
-                "examples": examples[:5],
-            }),
-            200,
-        )
+    return jsonify(_lookup_response(_lookup_cached(word))), 200
+
+
+@app.get("/lookup_batch")
+def lookup_batch() -> Response:
+    """Lookup translations for a comma-separated list of words in one request.
+
+    Each value in the response has the same shape as a ``/lookup`` response.
+    Upstream requests for uncached words run concurrently; words whose lookup
+    has not finished in time get the status ``pending`` and can be requested
+    again shortly.
+    """
+
+    words = [
+        word.strip()
+        for word in request.args.get("words", "").split(",")[:MAX_BATCH_WORDS]
+    ]
+    responses: Dict[str, dict] = {}
+    valid_words: List[str] = []
+    for word in dict.fromkeys(words):
+        if not word:
+            continue
+        if _is_valid_word(word):
+            valid_words.append(word)
+        else:
+            responses[word] = {"status": "invalid", "translation": "", "examples": []}
 
-    return (
-        jsonify({
-            "status": "not_found",
-            "translation": "",
-            "examples": examples[:5],
-        }),
-        200,
-    )
+    for word, result in _lookup_many(valid_words).items():
+        if result is _PENDING:
+            responses[word] = {"status": "pending", "translation": "", "examples": []}
+        else:
+            responses[word] = _lookup_response(result)
+    return jsonify(responses), 200
 
 
 @app.post("/add")
@@ -340,6 +670,10 @@ def add_entry_route() -> str:
         flash("請提供單字和解釋，才能新增！", "error")
         return redirect(url_for("index"))
 
+    if len(word) > MAX_WORD_LENGTH:
+        flash(f"單字或片語最多只能有 {MAX_WORD_LENGTH} 個字元。", "error")
+        return redirect(url_for("index"))
+
     if not _is_valid_word(word):
         flash("請輸入有效的英文單字或片語（僅限英文字母、空格、連字符或撇號）。", "error")
         return redirect(url_for("index"))
@@ -353,8 +687,13 @@ def add_entry_route() -> str:
         return redirect(url_for("index"))
 
     if lookup_state != "success":
-        translations = lookup_translation(word)
-        if not translations:
+        cached = _peek_translation(word)
+        if cached is _MISSING:
+            # The word was not looked up beforehand (e.g. the form was sent
+            # without the client-side lookup). Rather than holding the request
+            # open for the upstream API, warm the cache in the background.
+            _EXECUTOR.submit(_lookup_cached, word)
+        elif not cached or not cached[0]:
             flash("查無此單字，請檢查拼字後再試。", "error")
             return redirect(url_for("index"))
 
@@ -368,21 +707,15 @@ def add_entry_route() -> str:
 @app.post("/vocab/<entry_id>/delete")
 def delete_entry(entry_id: str) -> str:
     store = get_store()
-    entries = store.load()
-    remaining = []
-    removed_entry = None
+    entries, positions = store.load_indexed()
+    position = positions.get(entry_id)
 
-    for entry in entries:
-        if entry.get("id") == entry_id:
-            removed_entry = entry
-        else:
-            remaining.append(entry)
-
-    if removed_entry is None:
+    if position is None:
         flash("找不到要刪除的單字，可能已被移除。", "error")
         return redirect(url_for("vocab_book"))
 
-    store.save(remaining)
+    removed_entry = entries.pop(position)
+    store.save(entries)
     word = removed_entry.get("word") or ""
     flash(f"已刪除單字 {word}", "info")
     return redirect(url_for("vocab_book"))
@@ -391,8 +724,7 @@ def delete_entry(entry_id: str) -> str:
 @app.get("/review")
 def review() -> str:
     store = get_store()
-    entries = store.load()
-    due_entries = get_due_entries(entries)
+    entries, _, due_entries = store.load_with_derived()
     mode = request.args.get("mode", "").strip()
     if mode not in {"word-first", "definition-first"}:
         return render_template(
@@ -422,22 +754,20 @@ def review_result(entry_id: str) -> str:
     remembered = result == "remembered"
 
     store = get_store()
-    entries = store.load()
-    target_entry = None
-    for entry in entries:
-        if entry.get("id") == entry_id:
-            target_entry = entry
-            if mode == "definition-first":
-                answer = request.form.get("answer", "").strip()
-                if answer:
-                    remembered = answer.casefold() == entry.get("word", "").casefold()
-            break
-    else:
+    target_entry = store.load_entry(entry_id)
+    if target_entry is None:
         flash("找不到這個單字，可能已被刪除。", "error")
         return redirect(url_for("review", mode=mode))
 
+    if mode == "definition-first":
+        answer = request.form.get("answer", "").strip()
+        if answer:
+            remembered = answer.casefold() == target_entry.get("word", "").casefold()
+
     update_review_state(target_entry, remembered=remembered)
-    store.save(entries)
+    store.append_patch(
+        entry_id, {field: target_entry[field] for field in REVIEW_STATE_FIELDS}
+    )
 
     if mode == "definition-first":
         if remembered:
@@ -474,4 +804,5 @@ def review_skip(entry_id: str) -> str:
 
 
 if __name__ == "__main__":
+    # Development server only; see ``wsgi.py`` for running under gunicorn.
     app.run(host="0.0.0.0", port=5000, debug=True)
@@ -1,47 +1,329 @@
 """Core utilities for the vocabulary tracker."""
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import threading
 import uuid
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Tuple
+
+try:
+    import orjson
+except ImportError:  # The CLI only needs the standard library.
+    orjson = None
 
 DEFAULT_STORAGE = Path.home() / ".enlearn" / "vocab.json"
 DATE_FMT = "%Y-%m-%d"
+# Fields written by ``update_review_state``; a review only needs to persist these.
+REVIEW_STATE_FIELDS = ("interval_days", "success_streak", "next_review", "review_count")
+# Once the patch journal holds this many lines it is folded back into the
+# main storage file on the next load.
+JOURNAL_COMPACT_LINES = 200
+# The storage file is written compactly, which roughly halves its size and the
+# time to parse it. Set ``ENLEARN_PRETTY_JSON=1`` to keep it indented for
+# editing by hand.
+PRETTY_JSON = os.environ.get("ENLEARN_PRETTY_JSON", "").strip().lower() in {"1", "true", "yes"}
+
+
+def _loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps(entries: List[Dict[str, Any]]) -> bytes:
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if PRETTY_JSON:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(entries, option=option)
+    if PRETTY_JSON:
+        return json.dumps(entries, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(entries, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _digest(raw: bytes) -> str:
+    """Identify a storage file's content for matching it with its journal."""
+
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _dumps_line(value: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value) + b"\n"
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+# Parsed entries keyed by storage path, tagged with ``(st_mtime_ns, st_size)``
+# of both the storage file and its patch journal so unchanged files are not
+# re-read from disk.
+_FileVersion = Tuple[int, int, int, int]
+_NO_FILE: _FileVersion = (-1, -1, -1, -1)
+_STORE_CACHE: Dict[Path, Tuple[_FileVersion, List[Dict[str, Any]]]] = {}
+# Sorted and due views derived from the cached entries. Which entries are due
+# changes with the calendar day, so the date is part of the tag too.
+_DERIVED_CACHE: Dict[
+    Path, Tuple[_FileVersion, date, List[Dict[str, Any]], List[Dict[str, Any]]]
+] = {}
+# Number of due entries for pages that only show counts, tagged like
+# ``_DERIVED_CACHE`` but without building the sorted view.
+_DUE_COUNT_CACHE: Dict[Path, Tuple[_FileVersion, date, int]] = {}
+# Entry id -> list position for the cached entries, per file version.
+_INDEX_CACHE: Dict[Path, Tuple[_FileVersion, Dict[str, int]]] = {}
+# Flask may serve requests from several threads at once.
+_CACHE_LOCK = threading.RLock()
 
 
 class VocabularyStore:
-    """Handle persistence of vocabulary entries."""
+    """Handle persistence of vocabulary entries.
+
+    Besides the JSON storage file, single-entry updates can be appended to a
+    small ``<name>.journal.jsonl`` file next to it (see :meth:`append_patch`).
+    Loading folds the journal into the entries, and :meth:`save` rewrites the
+    storage file and clears the journal. The journal starts with a digest of
+    the storage file it was written against; if the file has since been
+    rewritten by other means (edited by hand, or saved by a copy of the tool
+    that ignores the journal) the journal is stale and is discarded.
+    """
 
     def __init__(self, path: Path) -> None:
         self.path = path
+        self.journal_path = path.with_name(f"{path.stem}.journal.jsonl")
         self.path.parent.mkdir(parents=True, exist_ok=True)
 
     def load(self) -> List[Dict[str, Any]]:
-        if not self.path.exists():
-            return []
-        with self.path.open("r", encoding="utf-8") as f:
-            try:
-                data = json.load(f)
-            except json.JSONDecodeError as exc:
-                raise ValueError(
-                    f"Storage file {self.path} is corrupted. Please fix or delete it."
-                ) from exc
+        """Return the stored entries as a list the caller may modify and save.
+
+        Parsing is shared through the in-process cache; each call receives its
+        own copy of every entry so mutations never leak into other requests.
+        Entries are flat dictionaries, so a shallow copy per entry suffices.
+        """
+
+        _, entries = self._load_cached_with_version()
+        return [dict(entry) for entry in entries]
+
+    def load_indexed(self) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """Return mutable entries together with a mapping from entry id to position.
+
+        The id index is built once per file version and shared between callers,
+        so it must not be modified. Positions refer to the returned list.
+        """
+
+        version, cached = self._load_cached_with_version()
+        positions = self._positions(version, cached)
+        return [dict(entry) for entry in cached], positions
+
+    def load_entry(self, entry_id: str) -> Dict[str, Any] | None:
+        """Return a copy of the entry with ``entry_id``, or ``None`` if there is none.
+
+        Unlike :meth:`load_indexed` only that entry is copied, which suits
+        updates that are persisted with :meth:`append_patch`.
+        """
+
+        version, cached = self._load_cached_with_version()
+        position = self._positions(version, cached).get(entry_id)
+        if position is None:
+            return None
+        return dict(cached[position])
+
+    def _positions(self, version: _FileVersion, entries: List[Dict[str, Any]]) -> Dict[str, int]:
+        with _CACHE_LOCK:
+            index_cached = _INDEX_CACHE.get(self.path)
+            if index_cached is None or index_cached[0] != version:
+                positions: Dict[str, int] = {}
+                for position, entry in enumerate(entries):
+                    positions.setdefault(entry["id"], position)
+                index_cached = (version, positions)
+                _INDEX_CACHE[self.path] = index_cached
+        return index_cached[1]
+
+    def load_cached(self) -> List[Dict[str, Any]]:
+        """Return entries, reusing the previous parse while the file is unchanged.
+
+        The returned list is shared between callers and must not be mutated;
+        use :meth:`load` when entries are going to be modified and saved.
+        """
+
+        return self._load_cached_with_version()[1]
+
+    def load_with_derived(
+        self,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Return ``(entries, sorted_entries, due_entries)`` for read-only use.
+
+        The sorted and due views are computed once per file version and day and
+        are shared between callers like :meth:`load_cached`'s list.
+        """
+
+        version, entries = self._load_cached_with_version()
+        now = datetime.utcnow()
+        today = now.date()
+        with _CACHE_LOCK:
+            cached = _DERIVED_CACHE.get(self.path)
+            if cached is None or cached[0] != version or cached[1] != today:
+                cached = (
+                    version,
+                    today,
+                    sort_entries(entries),
+                    get_due_entries(entries, as_of=now),
+                )
+                _DERIVED_CACHE[self.path] = cached
+        return entries, cached[2], cached[3]
+
+    def load_with_due_count(self) -> Tuple[List[Dict[str, Any]], int]:
+        """Return ``(entries, due_count)`` for read-only use.
+
+        The count is computed once per file version and day, reusing the due
+        view from :meth:`load_with_derived` when it is already cached.
+        """
+
+        version, entries = self._load_cached_with_version()
+        now = datetime.utcnow()
+        today = now.date()
+        with _CACHE_LOCK:
+            cached = _DUE_COUNT_CACHE.get(self.path)
+            if cached is None or cached[0] != version or cached[1] != today:
+                derived = _DERIVED_CACHE.get(self.path)
+                if derived is not None and derived[0] == version and derived[1] == today:
+                    due_count = len(derived[3])
+                else:
+                    due_count = count_due_entries(entries, as_of=now)
+                cached = (version, today, due_count)
+                _DUE_COUNT_CACHE[self.path] = cached
+        return entries, cached[2]
+
+    def _read(self) -> List[Dict[str, Any]]:
+        raw = self.path.read_bytes()
+        try:
+            data = _loads(raw)
+        except ValueError as exc:
+            # Both ``json.JSONDecodeError`` and ``orjson.JSONDecodeError``
+            # subclass ``ValueError``.
+            raise ValueError(
+                f"Storage file {self.path} is corrupted. Please fix or delete it."
+            ) from exc
         if not isinstance(data, list):
             raise ValueError("Storage file must contain a list of entries.")
 
+        patch_count = self._apply_journal(data, _digest(raw))
         changed = normalize_entries(data)
-        if changed:
+        if changed or patch_count >= JOURNAL_COMPACT_LINES:
             self.save(data)
         return data
 
+    def _apply_journal(self, entries: List[Dict[str, Any]], base: str) -> int:
+        """Fold journal patches into ``entries`` and return how many were read.
+
+        ``base`` is the digest of the storage file ``entries`` were parsed from.
+        """
+
+        try:
+            raw = self.journal_path.read_bytes()
+        except FileNotFoundError:
+            return 0
+
+        lines = raw.splitlines()
+        try:
+            header = _loads(lines[0])["base"]
+        except (IndexError, ValueError, TypeError, KeyError):
+            header = None
+        if header != base:
+            # The patches were recorded against a different version of the
+            # storage file; replaying them could revert newer changes.
+            self.journal_path.unlink(missing_ok=True)
+            return 0
+
+        # Duplicate ids resolve to the first match, as in ``load_indexed``.
+        positions: Dict[Any, int] = {}
+        for position, entry in enumerate(entries):
+            positions.setdefault(entry.get("id"), position)
+        count = 0
+        for line in lines[1:]:
+            if not line.strip():
+                continue
+            count += 1
+            try:
+                patch = _loads(line)
+                position = positions.get(patch["id"])
+                fields = dict(patch["fields"])
+            except (ValueError, TypeError, KeyError):
+                # A torn final line from an interrupted append; patches are
+                # absolute field values, so skipping it loses only that update.
+                continue
+            if position is not None:
+                entries[position].update(fields)
+        return count
+
+    def _version(self) -> _FileVersion:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return _NO_FILE
+        try:
+            journal_stat = self.journal_path.stat()
+        except FileNotFoundError:
+            journal_mtime_ns, journal_size = 0, 0
+        else:
+            journal_mtime_ns, journal_size = journal_stat.st_mtime_ns, journal_stat.st_size
+        # Sizes are part of the tag because some filesystems only record
+        # mtimes with coarse granularity.
+        return (stat.st_mtime_ns, stat.st_size, journal_mtime_ns, journal_size)
+
+    def _load_cached_with_version(self) -> Tuple[_FileVersion, List[Dict[str, Any]]]:
+        version = self._version()
+        if version == _NO_FILE:
+            return _NO_FILE, []
+        with _CACHE_LOCK:
+            cached = _STORE_CACHE.get(self.path)
+            if cached is not None and cached[0] == version:
+                return cached
+            entries = self._read()
+            _STORE_CACHE[self.path] = (version, entries)
+        return version, entries
+
+    def _invalidate(self) -> None:
+        with _CACHE_LOCK:
+            _STORE_CACHE.pop(self.path, None)
+            _DERIVED_CACHE.pop(self.path, None)
+            _DUE_COUNT_CACHE.pop(self.path, None)
+            _INDEX_CACHE.pop(self.path, None)
+
     def save(self, entries: List[Dict[str, Any]]) -> None:
         tmp_path = self.path.with_suffix(".tmp")
-        with tmp_path.open("w", encoding="utf-8") as f:
-            json.dump(entries, f, ensure_ascii=False, indent=2)
+        tmp_path.write_bytes(_dumps(entries))
         os.replace(tmp_path, self.path)
+        # The rewritten file already contains every journaled update.
+        self.journal_path.unlink(missing_ok=True)
+        self._invalidate()
+
+    def append_patch(self, entry_id: str, fields: Dict[str, Any]) -> None:
+        """Persist ``fields`` for one entry without rewriting the storage file."""
+
+        line = _dumps_line({"id": entry_id, "fields": fields})
+        with _CACHE_LOCK:
+            with self.journal_path.open("a+b") as f:
+                if f.seek(0, os.SEEK_END):
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        # Start a fresh line after a torn previous append.
+                        line = b"\n" + line
+                else:
+                    line = _dumps_line({"base": _digest(self.path.read_bytes())}) + line
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._invalidate()
+
+
+# Defaults for fields that older storage files may lack.
+_FIELD_DEFAULTS = {"interval_days": 1, "success_streak": 0, "context": ""}
+_REQUIRED_FIELDS = frozenset(
+    ("id", "created_at", *_FIELD_DEFAULTS, "next_review", "review_count")
+)
 
 
 def normalize_entries(entries: Iterable[Dict[str, Any]]) -> bool:
@@ -52,27 +334,19 @@ def normalize_entries(entries: Iterable[Dict[str, Any]]) -> bool:
 
     changed = False
     for entry in entries:
+        # Once a store has been normalized every entry has all fields, so a
+        # single C-level subset test replaces the per-field checks below.
+        if entry.keys() >= _REQUIRED_FIELDS:
+            continue
+        changed = True
         if "id" not in entry:
             entry["id"] = str(uuid.uuid4())
-            changed = True
         if "created_at" not in entry:
-            entry["created_at"] = datetime.utcnow().strftime(DATE_FMT)
-            changed = True
-        if "interval_days" not in entry:
-            entry["interval_days"] = 1
-            changed = True
-        if "success_streak" not in entry:
-            entry["success_streak"] = 0
-            changed = True
-        if "context" not in entry:
-            entry["context"] = ""
-            changed = True
-        if "next_review" not in entry:
-            entry["next_review"] = entry["created_at"]
-            changed = True
-        if "review_count" not in entry:
-            entry["review_count"] = 0
-            changed = True
+            entry["created_at"] = datetime.utcnow().date().isoformat()
+        for field, default in _FIELD_DEFAULTS.items():
+            entry.setdefault(field, default)
+        entry.setdefault("next_review", entry["created_at"])
+        entry.setdefault("review_count", 0)
     return changed
 
 
@@ -83,14 +357,58 @@ def create_entry(word: str, definition: str, context: str = "", now: datetime |
         "word": word,
         "definition": definition,
         "context": context,
-        "created_at": now.strftime(DATE_FMT),
-        "next_review": now.strftime(DATE_FMT),
+        "created_at": now.date().isoformat(),
+        "next_review": now.date().isoformat(),
         "interval_days": 1,
         "success_streak": 0,
         "review_count": 0,
     }
 
 
+def _is_iso_date(value: Any) -> bool:
+    """Return ``True`` when ``value`` is a zero-padded ``YYYY-MM-DD`` string."""
+
+    return (
+        isinstance(value, str)
+        and len(value) == 10
+        and value[4] == "-"
+        and value[7] == "-"
+        and value[:4].isdecimal()
+        and value[5:7].isdecimal()
+        and value[8:].isdecimal()
+    )
+
+
+def _sort_key(entry: Dict[str, Any]) -> Tuple[int, int, str]:
+    """Return the ``sort_entries`` key: review count, negated date, word."""
+
+    try:
+        review_count = int(entry.get("review_count", 0))
+    except (TypeError, ValueError):
+        review_count = 0
+
+    raw = entry.get("created_at")
+    if _is_iso_date(raw):
+        year, month, day = int(raw[:4]), int(raw[5:7]), int(raw[8:])
+    elif isinstance(raw, str):
+        try:
+            created_at = datetime.strptime(raw, DATE_FMT)
+        except ValueError:
+            created_at = datetime.min
+        year, month, day = created_at.year, created_at.month, created_at.day
+    else:
+        year, month, day = 1, 1, 1
+
+    word = entry.get("word")
+    # Negate a YYYYMMDD number so that more recent dates end up earlier in
+    # the ascending sort order.
+    return (
+        review_count,
+        -(year * 10000 + month * 100 + day),
+        word if isinstance(word, str) else "",
+    )
+
+
 def sort_entries(entries: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Return entries sorted by review urgency and recency.
 
@@ -100,49 +418,44 @@ def sort_entries(entries: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
     alphabetically by the word itself to keep the ordering stable.
     """
 
-    def _review_count(entry: Dict[str, Any]) -> int:
-        try:
-            return int(entry.get("review_count", 0))
-        except (TypeError, ValueError):
-            return 0
+    return sorted(entries, key=_sort_key)
 
-    def _created_at_order(entry: Dict[str, Any]) -> int:
-        raw = entry.get("created_at")
-        if isinstance(raw, str):
-            try:
-                created_at = datetime.strptime(raw, DATE_FMT)
-            except ValueError:
-                created_at = datetime.min
-        else:
-            created_at = datetime.min
-        # Use a negative ordinal so that more recent dates (with a larger
-        # ordinal) end up earlier in the ascending sort order.
-        return -created_at.toordinal()
-
-    def _word_key(entry: Dict[str, Any]) -> str:
-        word = entry.get("word")
-        if isinstance(word, str):
-            return word
-        return ""
-
-    return sorted(
-        entries,
-        key=lambda entry: (_review_count(entry), _created_at_order(entry), _word_key(entry)),
-    )
+
+def _review_date(entry: Dict[str, Any], cutoff: str) -> str:
+    """Return the entry's ``next_review`` as ``YYYY-MM-DD``, or ``cutoff`` if unusable."""
+
+    next_review = entry.get("next_review")
+    if _is_iso_date(next_review):
+        return next_review
+    try:
+        return datetime.strptime(next_review, DATE_FMT).date().isoformat()
+    except (TypeError, ValueError):
+        return cutoff
 
 
 def get_due_entries(entries: Iterable[Dict[str, Any]], as_of: datetime | None = None) -> List[Dict[str, Any]]:
-    as_of_date = (as_of or datetime.utcnow()).date()
-    due_entries: List[tuple[Dict[str, Any], datetime]] = []
+    # ``DATE_FMT`` dates order lexicographically, so well-formed values are
+    # compared and sorted as plain strings instead of being parsed one by one.
+    cutoff = (as_of or datetime.utcnow()).date().isoformat()
+    due_entries: List[Tuple[str, Dict[str, Any]]] = []
     for entry in entries:
-        try:
-            next_review = datetime.strptime(entry["next_review"], DATE_FMT).date()
-        except (KeyError, ValueError):
-            next_review = as_of_date
-        if next_review <= as_of_date:
-            due_entries.append((entry, datetime.combine(next_review, datetime.min.time())))
-    due_entries.sort(key=lambda item: item[1])
-    return [entry for entry, _ in due_entries]
+        next_review = _review_date(entry, cutoff)
+        if next_review <= cutoff:
+            due_entries.append((next_review, entry))
+    due_entries.sort(key=itemgetter(0))
+    return [entry for _, entry in due_entries]
+
+
+def count_due_entries(entries: Iterable[Dict[str, Any]], as_of: datetime | None = None) -> int:
+    """Return ``len(get_due_entries(entries, as_of))`` without building or sorting a list."""
+
+    cutoff = (as_of or datetime.utcnow()).date().isoformat()
+    return sum(1 for entry in entries if _review_date(entry, cutoff) <= cutoff)
+
+
+# Interval doubling capped at 30 days for the values a schedule normally goes
+# through; hand-edited intervals fall back to the same formula.
+_NEXT_INTERVAL = {1: 2, 2: 4, 4: 8, 8: 16, 16: 30, 30: 30}
 
 
 def update_review_state(entry: Dict[str, Any], remembered: bool, today: datetime | None = None) -> None:
@@ -150,12 +463,11 @@ def update_review_state(entry: Dict[str, Any], remembered: bool, today: datetime
     if remembered:
         entry["success_streak"] = entry.get("success_streak", 0) + 1
         interval = entry.get("interval_days", 1)
-        interval = max(1, min(30, interval * 2))
-        entry["interval_days"] = interval
+        entry["interval_days"] = _NEXT_INTERVAL.get(interval) or max(1, min(30, interval * 2))
     else:
         entry["success_streak"] = 0
         entry["interval_days"] = 1
     next_review_date = today + timedelta(days=entry["interval_days"])
-    entry["next_review"] = next_review_date.strftime(DATE_FMT)
+    entry["next_review"] = next_review_date.isoformat()
     entry["review_count"] = entry.get("review_count", 0) + 1
 
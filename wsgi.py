@@ -0,0 +1,16 @@
+"""WSGI entry point for serving the web app with a production server.
+
+Run from the project root, for example::
+
+    gunicorn -k gthread --threads 32 -w 2 wsgi:app
+
+or with cooperative gevent workers, which gunicorn monkey-patches before the
+app is imported so the blocking translation fetches yield to other requests::
+
+    gunicorn -k gevent -w 2 --worker-connections 100 wsgi:app
+"""
+from __future__ import annotations
+
+from app.app import app
+
+__all__ = ["app"]